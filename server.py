@@ -6,24 +6,57 @@ following the modern mcp_agent patterns.
 """
 
 import asyncio
+import glob
+import hashlib
+import io
 import os
 import logging
-from typing import Dict, Any
+import time
+from contextlib import AsyncExitStack, aclosing, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, ClassVar, Dict, Final, List, Optional, Set, Tuple
+
+import httpx2
+from anthropic import AsyncAnthropic
+from anthropic.types import Message
 
 from mcp_agent.app import MCPApp
 from mcp_agent.server.app_server import create_mcp_server_for_app
 from mcp_agent.agents.agent import Agent
-from mcp_agent.workflows.llm.augmented_llm import RequestParams
+from mcp_agent.workflows.llm.augmented_llm import AugmentedLLM, RequestParams
 from mcp_agent.workflows.llm.llm_selector import ModelPreferences
-from mcp_agent.workflows.llm.augmented_llm_anthropic import AnthropicAugmentedLLM
+from mcp_agent.workflows.llm.augmented_llm_anthropic import (
+    AnthropicAugmentedLLM,
+    AnthropicCompletionTasks,
+)
 from mcp_agent.workflows.llm.augmented_llm_openai import OpenAIAugmentedLLM
-from mcp_agent.workflows.parallel.parallel_llm import ParallelLLM
 from mcp_agent.executor.workflow import Workflow, WorkflowResult
 
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Semantic matching is optional; exact-match caching works without it
+    SentenceTransformer = None
+
+try:
+    import orjson
+except ImportError:  # Request bodies fall back to the SDK's own JSON encoder
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # The default asyncio event loop is used instead
+    uvloop = None
+
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# User-supplied text (tasks, topics, targets) is truncated to this length in logs
+LOG_PREVIEW_CHARS = 200
+
 # Create the VIRA app
 app = MCPApp(
     name="vira_agent_server", 
@@ -31,13 +64,939 @@ app = MCPApp(
 )
 
 
+# Static agent instructions and prompt preambles. These are sent unchanged on every
+# invocation, so they are kept byte-identical at module level and marked for
+# Anthropic prompt caching; only the small per-request details vary.
+PLANNING_INSTRUCTION = """You are VIRA's Planning Agent - an expert at breaking down complex tasks 
+into manageable, sequential steps. Your responsibilities:
+
+1. Analyze the task and understand requirements
+2. Break down into logical, executable steps
+3. Identify dependencies and prerequisites
+4. Estimate time and resources needed
+5. Create a detailed execution plan
+6. Monitor progress and adapt as needed
+
+Always provide structured, actionable plans with clear deliverables."""
+
+PLANNING_PROMPT = """Analyze the task below and create a detailed execution plan.
+
+Please provide:
+1. Task analysis and requirements
+2. Step-by-step execution plan
+3. Resource requirements
+4. Time estimates
+5. Success criteria
+6. Potential risks and mitigation strategies
+
+Format as a structured plan that can be executed autonomously."""
+
+RESEARCH_INSTRUCTION = """You are VIRA's Research Agent - an expert investigator and analyst.
+Your capabilities include:
+
+1. Comprehensive topic investigation
+2. Multi-source information gathering
+3. Critical analysis and synthesis
+4. Trend identification and pattern recognition
+5. Evidence-based conclusions
+6. Actionable insights generation
+
+Always provide thorough, well-sourced research with clear methodology and findings."""
+
+RESEARCH_PROMPT = """Conduct comprehensive research on the topic below.
+
+Please provide:
+1. Research methodology and approach
+2. Key findings and discoveries
+3. Analysis of current trends and developments
+4. Critical evaluation of sources and evidence
+5. Synthesized insights and conclusions
+6. Actionable recommendations
+7. Areas for further investigation
+
+Ensure the research is thorough, objective, and provides practical value."""
+
+ARCHITECT_INSTRUCTION = """You are a Software Architect. Design system architecture, 
+define interfaces, and create technical specifications. Focus on scalability, 
+maintainability, and best practices."""
+
+DEVELOPER_INSTRUCTION = """You are a Senior Developer. Write clean, efficient, well-documented code.
+Implement the architecture specifications with proper error handling, logging, 
+and following language-specific best practices."""
+
+TESTER_INSTRUCTION = """You are a QA Engineer. Create comprehensive test suites,
+identify edge cases, and ensure code quality. Write unit tests, integration tests,
+and provide testing strategies."""
+
+REVIEWER_INSTRUCTION = """You are a Code Reviewer. Analyze code for quality, security,
+performance, and maintainability. Provide constructive feedback and ensure
+adherence to coding standards and best practices."""
+
+DEVELOPMENT_ARCHITECTURE_PROMPT = """Design the system architecture and technical specifications for the development task below.
+
+Define the components, their interfaces, and the key technical decisions that the
+Developer and Tester will build on."""
+
+DEVELOPMENT_IMPLEMENTATION_PROMPT = """Implement the development task below following the architecture that comes after the task details.
+
+Deliver clean, documented, production-ready code with proper error handling."""
+
+DEVELOPMENT_TESTING_PROMPT = """Create tests for the development task below based on the architecture that comes after the task details.
+
+Cover unit and integration tests, edge cases, and the overall testing strategy."""
+
+DEVELOPMENT_ARCHITECTURE_REVIEW_PROMPT = """Review the architecture for the development task below before it is implemented.
+
+List concrete recommendations on quality, security, performance, and maintainability
+that the implementation must satisfy."""
+
+DEVELOPMENT_REVIEW_PROMPT = """Provide the final code review and recommendations for the development task below.
+
+The architecture, implementation, and tests follow the task details."""
+
+REVIEW_CHECK_INSTRUCTION = """You check implementations against code review recommendations.
+Answer with exactly one word: YES if the implementation satisfies every recommendation, NO otherwise."""
+
+REVIEW_CHECK_PROMPT = """Does the implementation below satisfy every recommendation in the review that precedes it?"""
+
+ORCHESTRATOR_INSTRUCTION = """You are VIRA's Master Orchestrator - the central intelligence that coordinates
+all specialized agents to execute complex projects. Your responsibilities:
+
+1. Project analysis and requirement gathering
+2. Agent selection and task delegation
+3. Workflow coordination and dependency management
+4. Progress monitoring and quality assurance
+5. Integration of results from multiple agents
+6. Final project delivery and documentation
+
+You have access to Planning, Research, and Development agents. Coordinate their efforts
+to deliver exceptional results that exceed user expectations."""
+
+ORCHESTRATION_PLANNING_PROMPT = """Break the project below into phases for the VIRA Orchestrator.
+
+For each phase provide its goal, ordered tasks, dependencies on other phases,
+and a completion milestone."""
+
+ORCHESTRATION_RESEARCH_PROMPT = """Investigate the project below for the VIRA Orchestrator.
+
+Identify the relevant technologies and prior art, key constraints, open questions,
+and the risks that should shape how the project is executed."""
+
+ORCHESTRATION_DEVELOPMENT_PROMPT = """Outline the technical approach to the project below for the VIRA Orchestrator.
+
+Cover the system architecture, key components and interfaces, implementation steps,
+and the testing and review strategy."""
+
+ORCHESTRATION_PROMPT = """Execute the complex project below with full agent coordination.
+
+The Planning Agent, Research Agent, and Development Team have already produced
+their contributions, which follow the project details. As the VIRA Orchestrator,
+coordinate the execution by:
+1. Reconciling the phases with the research findings and technical approach
+2. Determining which specialized agents own each task
+3. Managing dependencies between tasks
+4. Ensuring quality and integration
+5. Delivering comprehensive results
+
+Provide a complete project execution with all phases coordinated."""
+
+CLAUDE_CODE_INSTRUCTION = """You are VIRA's Claude Code Integration Specialist. You excel at:
+
+1. Repository analysis and code review
+2. Automated refactoring and optimization
+3. Git workflow management
+4. Project structure improvements
+5. Code generation and documentation
+6. Development workflow automation
+
+You work seamlessly with Claude Code CLI to provide advanced development capabilities
+that go beyond simple code execution to full repository management."""
+
+CLAUDE_CODE_PROMPT = """Execute Claude Code integration for the repository operation below.
+
+As the Claude Code specialist, provide:
+1. Analysis of the target repository/files
+2. Recommended Claude Code commands
+3. Step-by-step execution plan
+4. Expected outcomes and benefits
+5. Integration with development workflow
+6. Quality assurance and validation steps
+
+Ensure seamless integration between VIRA's intelligence and Claude Code's capabilities."""
+
+
+class _WorkflowRequest:
+    """
+    Base for typed workflow inputs. MCP clients send plain dictionaries; each
+    workflow converts its input once at the top of run(), applying defaults
+    for missing keys and ignoring unknown ones.
+    """
+
+    DETAILS_TEMPLATE: ClassVar[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        return cls(**{f.name: str(data[f.name]) for f in fields(cls) if f.name in data})
+
+    def details(self) -> str:
+        """Render the per-request prompt details"""
+        return self.DETAILS_TEMPLATE.format_map(self.__dict__)
+
+
+@dataclass(frozen=True)
+class DevRequest(_WorkflowRequest):
+    """CodeDevelopmentWorkflow input"""
+
+    DETAILS_TEMPLATE: ClassVar[str] = """Development Task: {task}
+Programming Language: {language}
+Requirements: {requirements}"""
+
+    task: str = "Code development task"
+    language: str = "python"
+    requirements: str = "Standard best practices"
+
+
+@dataclass(frozen=True)
+class ProjectRequest(_WorkflowRequest):
+    """VIRAOrchestrationWorkflow input"""
+
+    DETAILS_TEMPLATE: ClassVar[str] = """Project: {description}
+Type: {type}
+Priority: {priority}"""
+
+    description: str = "Complex project"
+    type: str = "general"
+    priority: str = "medium"
+
+
+@dataclass(frozen=True)
+class CodeRequest(_WorkflowRequest):
+    """ClaudeCodeIntegrationWorkflow input"""
+
+    DETAILS_TEMPLATE: ClassVar[str] = """Operation: {operation}
+Target: {target}
+Prompt: {prompt}"""
+
+    operation: str = "analyze"
+    target: str = "."
+    prompt: str = "Analyze and improve this code"
+
+
+# Anthropic serves marked prefixes (tools + system + cached message blocks) from its
+# prompt cache. Prefixes below the model's minimum cacheable length are simply not cached.
+EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+
+def text_block(text: str) -> Dict[str, Any]:
+    """Build a plain Anthropic text content block"""
+    return {"type": "text", "text": text}
+
+
+def cached_text_block(text: str) -> Dict[str, Any]:
+    """Build an Anthropic text content block marked for prompt caching"""
+    return {**text_block(text), "cache_control": EPHEMERAL_CACHE}
+
+
+def cached_user_message(preamble: str, details: str) -> Dict[str, Any]:
+    """
+    Build a user message whose static preamble is cached ahead of the dynamic details.
+
+    The breakpoint caches the whole prefix up to the preamble (tools, system blocks,
+    and the preamble itself), which extends the system-block breakpoint's prefix;
+    the model's minimum cacheable length applies to that prefix as a whole.
+
+    Args:
+        preamble: Unchanging prompt text shared by every invocation of a workflow
+        details: Per-request text (task, topic, project fields)
+
+    Returns:
+        An Anthropic MessageParam with the preamble as a cached prefix block
+    """
+    return {"role": "user", "content": [cached_text_block(preamble), text_block(details)]}
+
+
+# Explicit output budgets per call so open-ended generations stop sooner
+PLANNING_MAX_TOKENS = 1024
+RESEARCH_MAX_TOKENS = 4096
+DEVELOPMENT_MAX_TOKENS = 2048
+ORCHESTRATION_PHASE_MAX_TOKENS = 1024
+ORCHESTRATION_MAX_TOKENS = 4096
+CLAUDE_CODE_MAX_TOKENS = 2048
+REVIEW_CHECK_MAX_TOKENS = 8
+
+# Minimum seconds between partial-result updates published to workflow state
+PARTIAL_PUBLISH_INTERVAL = 0.5
+
+# Receives streamed text deltas for the current workflow run, when one is listening
+_PARTIAL_SINK: ContextVar[Optional[Callable[[str], None]]] = ContextVar("partial_sink", default=None)
+
+
+@contextmanager
+def partial_results(workflow: Workflow):
+    """
+    Publish streamed completion text to workflow.state.metadata["partial_result"].
+
+    MCP clients polling the run's status see the response as it is generated
+    instead of waiting for the final WorkflowResult.
+    """
+    buffer = io.StringIO()
+    last_publish = 0.0
+
+    def on_text(text: str):
+        nonlocal last_publish
+        buffer.write(text)
+        now = time.monotonic()
+        if now - last_publish >= PARTIAL_PUBLISH_INTERVAL:
+            workflow.state.metadata["partial_result"] = buffer.getvalue()
+            last_publish = now
+
+    token = _PARTIAL_SINK.set(on_text)
+    try:
+        yield
+    finally:
+        _PARTIAL_SINK.reset(token)
+        workflow.state.metadata.pop("partial_result", None)
+
+
+def _create_shared_http_client() -> httpx2.AsyncClient:
+    """
+    Build the keep-alive connection pool shared by every Anthropic call.
+    HTTP/2 multiplexes concurrent completions over one connection when the
+    optional h2 package is installed; otherwise the pool falls back to HTTP/1.1.
+    """
+    limits = httpx2.Limits(max_connections=100, max_keepalive_connections=50)
+    # Non-streamed completions can take minutes, so only the read timeout is relaxed
+    timeout = httpx2.Timeout(60.0, read=600.0)
+    try:
+        return httpx2.AsyncClient(http2=True, limits=limits, timeout=timeout)
+    except ImportError:
+        return httpx2.AsyncClient(limits=limits, timeout=timeout)
+
+
+_SHARED_HTTPX = _create_shared_http_client()
+
+
+MAX_BATCH = 16
+BATCH_WINDOW_MS = 20
+
+# Per-model admission limits; size VIRA_TOKENS_PER_MINUTE to the Anthropic tier
+MAX_INFLIGHT = int(os.getenv("VIRA_MAX_INFLIGHT", "16"))
+TOKENS_PER_MINUTE = int(os.getenv("VIRA_TOKENS_PER_MINUTE", "400000"))
+
+
+def _metered_tokens(usage: Any) -> int:
+    # Cache writes are reported apart from input_tokens but count toward the input rate limit
+    return usage.input_tokens + (usage.cache_creation_input_tokens or 0) + usage.output_tokens
+
+
+class TokenBucket:
+    """
+    Tokens-per-minute budget for one model.
+
+    Requests are admitted while the bucket holds tokens and are debited with
+    their actual usage once the response arrives, so the bucket can run into debt
+    and later callers wait for it to refill.
+    """
+
+    def __init__(self, tokens_per_minute: int = TOKENS_PER_MINUTE):
+        self.capacity = float(tokens_per_minute)
+        self.rate = self.capacity / 60
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until the bucket is out of debt"""
+        self._refill()
+        while self._tokens <= 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+            self._refill()
+
+    def record(self, tokens: int):
+        """Debit the tokens a completed request actually used"""
+        self._refill()
+        self._tokens -= tokens
+
+
+_JSON_HEADERS: Final[Dict[str, str]] = {"Content-Type": "application/json"}
+
+
+def _orjson_default(value: Any) -> Any:
+    # Pydantic content blocks are dumped the same way the SDK's transform does
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_unset=True)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class AnthropicBatcher:
+    """
+    Coalesces concurrent Anthropic completion requests onto one shared client.
+
+    Requests are queued and a background task drains up to max_batch of them every
+    batch_window_ms, dispatching each batch with asyncio.gather over _SHARED_HTTPX
+    instead of a fresh client (and TLS handshake) per call.
+    Each call is admitted through its model's MAX_INFLIGHT semaphore and
+    TokenBucket, so bursts queue here instead of piling onto the API.
+    Requests submitted inside partial_results() are streamed.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = MAX_BATCH,
+        batch_window_ms: float = BATCH_WINDOW_MS,
+    ):
+        self.max_batch = max_batch
+        self.batch_window = batch_window_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Future] = set()
+        self._clients: Dict[Optional[str], AsyncAnthropic] = {}
+        self._admission: Dict[str, Tuple[asyncio.Semaphore, TokenBucket]] = {}
+
+    def _client(self, api_key: Optional[str]) -> AsyncAnthropic:
+        client = self._clients.get(api_key)
+        if client is None:
+            client = self._clients[api_key] = AsyncAnthropic(
+                api_key=api_key,
+                http_client=_SHARED_HTTPX,
+            )
+        return client
+
+    def _admission_for(self, model: str) -> Tuple[asyncio.Semaphore, TokenBucket]:
+        admission = self._admission.get(model)
+        if admission is None:
+            admission = self._admission[model] = (asyncio.Semaphore(MAX_INFLIGHT), TokenBucket())
+        return admission
+
+    async def submit(self, payload: Dict[str, Any], api_key: Optional[str] = None):
+        """
+        Queue a messages.create request and wait for its response.
+
+        Args:
+            payload: Keyword arguments for messages.create
+            api_key: Anthropic API key; None falls back to ANTHROPIC_API_KEY
+
+        Returns:
+            The Anthropic Message response
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._drain())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((payload, api_key, _PARTIAL_SINK.get(), future))
+        return await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch without awaiting so the next batch is not held behind this one
+            dispatch = asyncio.gather(*(self._complete(*item) for item in batch))
+            self._inflight.add(dispatch)
+            dispatch.add_done_callback(self._inflight.discard)
+
+    async def _complete(
+        self,
+        payload: Dict[str, Any],
+        api_key: Optional[str],
+        on_text: Optional[Callable[[str], None]],
+        future: asyncio.Future,
+    ):
+        semaphore, bucket = self._admission_for(payload.get("model", ""))
+        try:
+            async with semaphore:
+                await bucket.acquire()
+                client = self._client(api_key)
+                if on_text is None and orjson is not None:
+                    # Send the body pre-encoded so the multi-KB instructions are
+                    # serialized by orjson rather than the SDK's stdlib encoder.
+                    # Posting directly skips what messages.create adds on top:
+                    # - its model-deprecation warning (messages.stream, used by
+                    #   every streamed workflow, still emits it)
+                    # - the max_tokens-based non-streaming timeout and its error
+                    #   for requests expected to exceed ten minutes; our
+                    #   *_MAX_TOKENS caps are far below that limit, and the shared
+                    #   client's 600s read timeout still applies
+                    # - TypedDict transformation of params, which is a no-op for
+                    #   the plain dicts mcp_agent builds
+                    response = await client.post(
+                        "/v1/messages",
+                        cast_to=Message,
+                        content=orjson.dumps(payload, default=_orjson_default),
+                        options={"headers": _JSON_HEADERS},
+                    )
+                elif on_text is None:
+                    response = await client.messages.create(**payload)
+                else:
+                    async with client.messages.stream(**payload) as stream:
+                        async for text in stream.text_stream:
+                            on_text(text)
+                        response = await stream.get_final_message()
+                bucket.record(_metered_tokens(response.usage))
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(response)
+
+    async def aclose(self):
+        """Stop the drain task; the shared HTTP client is closed separately by main()"""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._clients.clear()
+        self._admission.clear()
+
+
+_BATCHER = AnthropicBatcher()
+
+
+class _BatchedCompletionExecutor:
+    """
+    Executor proxy that sends Anthropic completion tasks through _BATCHER.
+    Everything else (tool calls, other providers, Temporal) goes to the wrapped executor.
+    """
+
+    def __init__(self, executor):
+        self._executor = executor
+
+    def __getattr__(self, name):
+        return getattr(self._executor, name)
+
+    async def execute(self, task, *args, **kwargs):
+        request = args[0] if args else None
+        if (
+            task is AnthropicCompletionTasks.request_completion_task
+            and self._executor.execution_engine == "asyncio"
+            and request.config is not None
+            and request.config.provider in (None, "", "anthropic")
+        ):
+            try:
+                return await _BATCHER.submit(request.payload, api_key=request.config.api_key)
+            except Exception as e:
+                logger.error("Error executing Anthropic completion: %s", e)
+                return e
+
+        return await self._executor.execute(task, *args, **kwargs)
+
+
+class CachedAnthropicAugmentedLLM(AnthropicAugmentedLLM):
+    """
+    AnthropicAugmentedLLM that sends the agent instruction as a cached system block.
+    The structured system array is passed through RequestParams.metadata, which
+    mcp_agent merges into the outgoing messages.create arguments. Completions are
+    dispatched through the shared AnthropicBatcher.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executor = _BatchedCompletionExecutor(self.executor)
+
+        if self.instruction:
+            metadata = dict(self.default_request_params.metadata or {})
+            metadata["system"] = [cached_text_block(self.instruction)]
+            self.default_request_params = self.default_request_params.model_copy(
+                update={"metadata": metadata}
+            )
+
+    async def generate(self, message, request_params: RequestParams | None = None):
+        responses = await super().generate(message=message, request_params=request_params)
+
+        cache_read = sum(getattr(r.usage, "cache_read_input_tokens", 0) or 0 for r in responses)
+        cache_write = sum(getattr(r.usage, "cache_creation_input_tokens", 0) or 0 for r in responses)
+        logger.debug("%s: prompt cache read=%d write=%d tokens", self.name, cache_read, cache_write)
+        return responses
+
+
+# Model tiers: (model, preferences). Implementation, tests, and review checks run on
+# a fast, cheap model; only design, review, and final synthesis use the larger models.
+MODEL_TIERS: Dict[str, tuple] = {
+    "fast": (
+        os.getenv("VIRA_FAST_MODEL", "claude-haiku-5-5"),
+        ModelPreferences(costPriority=0.7, speedPriority=0.2, intelligencePriority=0.1),
+    ),
+    "balanced": (
+        os.getenv("VIRA_BALANCED_MODEL", "claude-sonnet-5-5"),
+        ModelPreferences(intelligencePriority=0.8, costPriority=0.1, speedPriority=0.1),
+    ),
+    "deep": (
+        os.getenv("VIRA_DEEP_MODEL", "claude-opus-5-5"),
+        ModelPreferences(intelligencePriority=0.9, costPriority=0.05, speedPriority=0.05),
+    ),
+}
+
+# Agent name (role) -> model tier. Unlisted roles use the balanced tier.
+ROLE_TIERS: Dict[str, str] = {
+    "review_checker": "fast",
+    "developer": "fast",
+    "tester": "fast",
+    "orchestration_planner": "fast",
+    "architect": "balanced",
+    "research_agent": "balanced",
+    "live_research_agent": "balanced",
+    "planning_agent": "balanced",
+    "claude_code_specialist": "balanced",
+    "orchestration_researcher": "balanced",
+    "orchestration_developer": "balanced",
+    "reviewer": "deep",
+    "vira_orchestrator": "deep",
+}
+
+
+def model_factory(role: Optional[str] = None) -> Callable[..., AugmentedLLM]:
+    """
+    Build an llm_factory that sizes the Anthropic model to the agent's role.
+
+    Args:
+        role: Role used to pick the model tier; defaults to the agent's name
+
+    Returns:
+        A factory usable with Agent.attach_llm
+    """
+
+    def factory(agent: Optional[Agent] = None, **kwargs) -> CachedAnthropicAugmentedLLM:
+        tier = ROLE_TIERS.get(role or (agent.name if agent else ""), "balanced")
+        model, preferences = MODEL_TIERS[tier]
+
+        llm = CachedAnthropicAugmentedLLM(agent=agent, **kwargs)
+        llm.default_request_params = llm.default_request_params.model_copy(
+            update={"model": model, "modelPreferences": preferences}
+        )
+        return llm
+
+    return factory
+
+
+@dataclass
+class _CacheEntry:
+    workflow_name: str
+    response: str
+    expires_at: float
+    embedding: Any = None
+
+
+class SemanticLLMCache:
+    """
+    TTL response cache for idempotent workflows.
+
+    Lookups first try an exact MD5 match on (workflow, prompt). When
+    sentence-transformers is installed, misses fall back to a cosine-similarity
+    search over embeddings of previously answered prompts for the same workflow,
+    so paraphrased requests are served without another LLM round trip.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.95,
+        cache_ttl: float = 3600,
+        max_entries: int = 1024,
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.cache_ttl = cache_ttl
+        self.max_entries = max_entries
+        self.embedding_model = embedding_model
+        self._encoder = None
+        self._entries: Dict[str, _CacheEntry] = {}
+
+    @staticmethod
+    def _hash(workflow_name: str, prompt: str) -> str:
+        return hashlib.md5(f"{workflow_name}\0{prompt}".encode()).hexdigest()
+
+    async def _embed(self, prompt: str):
+        if SentenceTransformer is None:
+            return None
+        if self._encoder is None:
+            self._encoder = await asyncio.to_thread(SentenceTransformer, self.embedding_model)
+        return await asyncio.to_thread(self._encoder.encode, prompt, normalize_embeddings=True)
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [k for k, entry in self._entries.items() if entry.expires_at <= now]:
+            del self._entries[key]
+
+    def _nearest(self, workflow_name: str, embedding) -> Optional[str]:
+        best_response, best_score = None, self.similarity_threshold
+        for entry in self._entries.values():
+            if entry.workflow_name != workflow_name or entry.embedding is None:
+                continue
+            score = float(np.dot(entry.embedding, embedding))
+            if score >= best_score:
+                best_response, best_score = entry.response, score
+        return best_response
+
+    async def get_or_generate(
+        self,
+        workflow_name: str,
+        prompt: str,
+        generate: Callable[[], Awaitable[str]],
+    ) -> str:
+        """
+        Return a cached response for the prompt, or generate and store a new one.
+
+        Args:
+            workflow_name: Namespace for the entry; responses never cross workflows
+            prompt: The request-specific prompt text used as the cache key
+            generate: Coroutine factory invoked on a cache miss
+
+        Returns:
+            The cached or freshly generated response
+        """
+        self._evict_expired()
+        key = self._hash(workflow_name, prompt)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            logger.info("%s: exact response cache hit", workflow_name)
+            return entry.response
+
+        embedding = await self._embed(prompt)
+        if embedding is not None:
+            response = self._nearest(workflow_name, embedding)
+            if response is not None:
+                logger.info("%s: semantic response cache hit", workflow_name)
+                return response
+
+        response = await generate()
+        if not response:
+            return response
+
+        if len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = _CacheEntry(
+            workflow_name=workflow_name,
+            response=response,
+            expires_at=time.monotonic() + self.cache_ttl,
+            embedding=embedding,
+        )
+        return response
+
+
+# Shared across Planning and Research requests
+response_cache = SemanticLLMCache()
+
+
+RESEARCH_CORPUS_DIR = os.getenv(
+    "VIRA_RESEARCH_CORPUS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "research_corpus"),
+)
+
+# Evergreen reference documents for ResearchWorkflow, loaded once by main()
+KNOWLEDGE_BASE = ""
+
+
+def load_knowledge_base(corpus_dir: str = RESEARCH_CORPUS_DIR) -> str:
+    """
+    Concatenate the research corpus into one document for cache-augmented generation.
+
+    Files are read in sorted order so the cached prompt prefix stays byte-identical
+    across restarts.
+
+    Args:
+        corpus_dir: Directory containing the *.md reference documents
+
+    Returns:
+        The combined knowledge base, or an empty string if there are no documents
+    """
+    sections = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.md"))):
+        with open(path, encoding="utf-8") as f:
+            sections.append(f"## {os.path.basename(path)}\n\n{f.read().strip()}")
+
+    if not sections:
+        return ""
+    return "Reference knowledge base. Prefer these documents as sources:\n\n" + "\n\n".join(sections)
+
+
+@dataclass(frozen=True)
+class ServerFlags:
+    """Which optional MCP servers are configured; computed once in main()"""
+
+    has_fs: bool
+    has_fetch: bool
+
+    @classmethod
+    def from_config(cls, config) -> "ServerFlags":
+        return cls(
+            has_fs="filesystem" in config.mcp.servers,
+            has_fetch="fetch" in config.mcp.servers,
+        )
+
+
+# Shared server_names lists; never mutate these
+_NO_SERVERS: List[str] = []
+_FS_SERVERS: List[str] = ["filesystem"]
+_FETCH_SERVERS: List[str] = ["fetch"]
+_FS_FETCH_SERVERS: List[str] = ["filesystem", "fetch"]
+
+
+# Connected agents and their attached LLMs, keyed by agent name. Agents are entered
+# once and stay connected to their MCP servers for the lifetime of the app.
+_AGENT_REGISTRY: Dict[str, Tuple[Agent, AugmentedLLM]] = {}
+# One lock per agent name, so slow first-time MCP connections never queue unrelated agents
+_AGENT_REGISTRY_LOCKS: Dict[str, asyncio.Lock] = {}
+_AGENT_STACK = AsyncExitStack()
+
+
+@asynccontextmanager
+async def agent_registry():
+    """Keep registered agents connected until the app shuts down"""
+    try:
+        async with _AGENT_STACK:
+            yield _AGENT_REGISTRY
+    finally:
+        _AGENT_REGISTRY.clear()
+        _AGENT_REGISTRY_LOCKS.clear()
+
+
+async def get_agent_llm(
+    name: str,
+    instruction: str,
+    server_names: Optional[List[str]] = None,
+    knowledge: Optional[str] = None,
+) -> AugmentedLLM:
+    """
+    Return the LLM attached to a named agent, connecting the agent on first use.
+
+    Args:
+        name: Agent name; also selects the model tier via ROLE_TIERS
+        instruction: The agent's instruction
+        server_names: MCP servers the agent connects to
+        knowledge: Static reference text cached at the end of the system prompt
+
+    Returns:
+        The agent's attached LLM, shared by every workflow invocation
+    """
+    entry = _AGENT_REGISTRY.get(name)
+    if entry is None:
+        async with _AGENT_REGISTRY_LOCKS.setdefault(name, asyncio.Lock()):
+            entry = _AGENT_REGISTRY.get(name)
+            if entry is None:
+                agent = Agent(name=name, instruction=instruction, server_names=server_names or [])
+                await _AGENT_STACK.enter_async_context(agent)
+                logger.info("%s: Connected", name)
+
+                llm = await agent.attach_llm(model_factory())
+                # Invocations are independent; a shared LLM must not accumulate history
+                update: Dict[str, Any] = {"use_history": False}
+                if knowledge:
+                    metadata = dict(llm.default_request_params.metadata or {})
+                    # One breakpoint after the knowledge base caches the instruction with it
+                    instruction_blocks = [text_block(block["text"]) for block in metadata.get("system", [])]
+                    metadata["system"] = [*instruction_blocks, cached_text_block(knowledge)]
+                    update["metadata"] = metadata
+                llm.default_request_params = llm.default_request_params.model_copy(update=update)
+                entry = _AGENT_REGISTRY[name] = (agent, llm)
+    return entry[1]
+
+
+def _require_response(workflow_name: str, response: str) -> str:
+    """
+    Reject the empty string mcp_agent's generate_str returns after a failed completion.
+
+    Args:
+        workflow_name: Workflow reported in the error
+        response: Text returned by the agent
+
+    Returns:
+        The response, when it is non-empty
+    """
+    if not response:
+        raise RuntimeError(f"{workflow_name}: the model returned no response; see the completion error logged above")
+    return response
+
+
+class SingleAgentWorkflow(Workflow[str]):
+    """
+    Base for workflows that send one cached prompt to one registered agent.
+
+    Subclasses configure the agent through the class attributes below and call
+    generate() from their own @app.workflow_run method, which keeps each
+    workflow's MCP tool name and parameter schema.
+    """
+
+    AGENT_NAME: ClassVar[str]
+    INSTRUCTION: ClassVar[str]
+    PROMPT: ClassVar[str]
+    MAX_TOKENS: ClassVar[int]
+    USE_RESPONSE_CACHE: ClassVar[bool] = True
+
+    def server_names(self, flags: ServerFlags) -> List[str]:
+        """MCP servers the agent connects to"""
+        return _NO_SERVERS
+
+    def knowledge(self) -> Optional[str]:
+        """Static reference text sent as a cached system block"""
+        return None
+
+    async def generate(self, details: str) -> WorkflowResult[str]:
+        """
+        Run the agent on the per-request prompt details.
+
+        Args:
+            details: The dynamic tail of the prompt, sent after the cached PROMPT
+
+        Returns:
+            WorkflowResult containing the agent's response
+        """
+        workflow_name = type(self).__name__
+
+        llm = await get_agent_llm(
+            self.AGENT_NAME,
+            self.INSTRUCTION,
+            server_names=self.server_names(app.context.server_flags),
+            knowledge=self.knowledge(),
+        )
+        logger.info("%s: %s generating...", workflow_name, self.AGENT_NAME)
+
+        async def request() -> str:
+            response = await llm.generate_str(
+                message=cached_user_message(self.PROMPT, details),
+                request_params=RequestParams(maxTokens=self.MAX_TOKENS),
+            )
+            return _require_response(workflow_name, response)
+
+        with partial_results(self):
+            if self.USE_RESPONSE_CACHE:
+                result = await response_cache.get_or_generate(workflow_name, details, request)
+            else:
+                result = await request()
+
+        logger.info("%s completed: %d characters generated", workflow_name, len(result))
+        return WorkflowResult(value=result)
+
+
 @app.workflow
-class PlanningWorkflow(Workflow[str]):
+class PlanningWorkflow(SingleAgentWorkflow):
     """
     Autonomous task planning and execution workflow.
     This agent breaks down complex tasks into manageable steps and coordinates execution.
     """
 
+    AGENT_NAME = "planning_agent"
+    INSTRUCTION = PLANNING_INSTRUCTION
+    PROMPT = PLANNING_PROMPT
+    MAX_TOKENS = PLANNING_MAX_TOKENS
+
+    def server_names(self, flags: ServerFlags) -> List[str]:
+        return _FS_SERVERS if flags.has_fs else _NO_SERVERS
+
     @app.workflow_run
     async def run(self, task_description: str) -> WorkflowResult[str]:
         """
@@ -50,67 +1009,30 @@ class PlanningWorkflow(Workflow[str]):
             WorkflowResult containing the execution plan and results
         """
         
-        logger.info(f"PlanningWorkflow received task: {task_description}")
-        
-        # Add current directory to filesystem access if available
-        context = app.context
-        if "filesystem" in context.config.mcp.servers:
-            context.config.mcp.servers["filesystem"].args.extend([os.getcwd()])
-
-        planning_agent = Agent(
-            name="planning_agent",
-            instruction="""You are VIRA's Planning Agent - an expert at breaking down complex tasks 
-            into manageable, sequential steps. Your responsibilities:
-            
-            1. Analyze the task and understand requirements
-            2. Break down into logical, executable steps
-            3. Identify dependencies and prerequisites
-            4. Estimate time and resources needed
-            5. Create a detailed execution plan
-            6. Monitor progress and adapt as needed
-            
-            Always provide structured, actionable plans with clear deliverables.""",
-            server_names=["filesystem"] if "filesystem" in context.config.mcp.servers else [],
-        )
-
-        async with planning_agent:
-            logger.info("Planning Agent: Connected, analyzing task...")
-            
-            llm = await planning_agent.attach_llm(AnthropicAugmentedLLM)
-            
-            # Generate initial plan
-            plan_result = await llm.generate_str(
-                message=f"""Analyze this task and create a detailed execution plan: {task_description}
-                
-                Please provide:
-                1. Task analysis and requirements
-                2. Step-by-step execution plan
-                3. Resource requirements
-                4. Time estimates
-                5. Success criteria
-                6. Potential risks and mitigation strategies
-                
-                Format as a structured plan that can be executed autonomously.""",
-                request_params=RequestParams(
-                    modelPreferences=ModelPreferences(
-                        intelligencePriority=0.8,
-                        costPriority=0.1,
-                        speedPriority=0.1,
-                    )
-                )
-            )
-            
-            logger.info(f"Planning completed: {len(plan_result)} characters generated")
-            return WorkflowResult(value=plan_result)
+        logger.info("PlanningWorkflow received task: %s", task_description[:LOG_PREVIEW_CHARS])
+        return await self.generate(f"Task: {task_description}")
 
 
 @app.workflow
-class ResearchWorkflow(Workflow[str]):
+class ResearchWorkflow(SingleAgentWorkflow):
     """
     Autonomous research and analysis workflow.
-    This agent conducts comprehensive research on topics and generates insights.
+    This agent conducts comprehensive research on topics and generates insights,
+    answering from the preloaded research corpus when one is configured.
     """
 
+    AGENT_NAME = "research_agent"
+    INSTRUCTION = RESEARCH_INSTRUCTION
+    PROMPT = RESEARCH_PROMPT
+    MAX_TOKENS = RESEARCH_MAX_TOKENS
+
+    def server_names(self, flags: ServerFlags) -> List[str]:
+        # The cached knowledge base replaces live fetches; LiveResearchWorkflow keeps them
+        return _FETCH_SERVERS if flags.has_fetch and not KNOWLEDGE_BASE else _NO_SERVERS
+
+    def knowledge(self) -> Optional[str]:
+        return KNOWLEDGE_BASE
+
     @app.workflow_run
     async def run(self, research_topic: str) -> WorkflowResult[str]:
         """
@@ -123,144 +1045,185 @@ class ResearchWorkflow(Workflow[str]):
             WorkflowResult containing comprehensive research findings
         """
         
-        logger.info(f"ResearchWorkflow investigating: {research_topic}")
-        
-        context = app.context
-        available_servers = ["fetch"] if "fetch" in context.config.mcp.servers else []
+        logger.info("ResearchWorkflow investigating: %s", research_topic[:LOG_PREVIEW_CHARS])
+        return await self.generate(f"Research topic: {research_topic}")
+
+
+@app.workflow
+class LiveResearchWorkflow(SingleAgentWorkflow):
+    """
+    Research workflow that gathers live data through the fetch server.
+    Use when the topic needs sources newer than the preloaded research corpus.
+    """
+
+    AGENT_NAME = "live_research_agent"
+    INSTRUCTION = RESEARCH_INSTRUCTION
+    PROMPT = RESEARCH_PROMPT
+    MAX_TOKENS = RESEARCH_MAX_TOKENS
+    USE_RESPONSE_CACHE = False
+
+    def server_names(self, flags: ServerFlags) -> List[str]:
+        return _FETCH_SERVERS if flags.has_fetch else _NO_SERVERS
+
+    @app.workflow_run
+    async def run(self, research_topic: str) -> WorkflowResult[str]:
+        """
+        Conduct research on a topic using live web sources.
+
+        Args:
+            research_topic: The topic to research
+
+        Returns:
+            WorkflowResult containing comprehensive research findings
+        """
         
-        research_agent = Agent(
-            name="research_agent",
-            instruction="""You are VIRA's Research Agent - an expert investigator and analyst.
-            Your capabilities include:
-            
-            1. Comprehensive topic investigation
-            2. Multi-source information gathering
-            3. Critical analysis and synthesis
-            4. Trend identification and pattern recognition
-            5. Evidence-based conclusions
-            6. Actionable insights generation
-            
-            Always provide thorough, well-sourced research with clear methodology and findings.""",
-            server_names=available_servers,
-        )
+        logger.info("LiveResearchWorkflow investigating: %s", research_topic[:LOG_PREVIEW_CHARS])
+        return await self.generate(f"Research topic: {research_topic}")
 
-        async with research_agent:
-            logger.info("Research Agent: Connected, beginning investigation...")
-            
-            llm = await research_agent.attach_llm(AnthropicAugmentedLLM)
-            
-            # Conduct research
-            research_result = await llm.generate_str(
-                message=f"""Conduct comprehensive research on: {research_topic}
-                
-                Please provide:
-                1. Research methodology and approach
-                2. Key findings and discoveries
-                3. Analysis of current trends and developments
-                4. Critical evaluation of sources and evidence
-                5. Synthesized insights and conclusions
-                6. Actionable recommendations
-                7. Areas for further investigation
-                
-                Ensure the research is thorough, objective, and provides practical value.""",
-                request_params=RequestParams(
-                    modelPreferences=ModelPreferences(
-                        intelligencePriority=0.9,
-                        costPriority=0.05,
-                        speedPriority=0.05,
-                    )
-                )
-            )
-            
-            logger.info(f"Research completed: comprehensive analysis generated")
-            return WorkflowResult(value=research_result)
+
+@lru_cache(maxsize=512)
+def _build_dev_prompt(task: str, language: str, requirements: str) -> str:
+    """Render CodeDevelopmentWorkflow prompt details once per distinct request"""
+    return DevRequest(task=task, language=language, requirements=requirements).details()
+
+
+# Exact-match responses for deterministic development requests, keyed by prompt digest
+_DEV_RESPONSE_CACHE: Dict[str, str] = {}
+_DEV_RESPONSE_CACHE_SIZE = 512
+_DEV_RESPONSE_LOCK = asyncio.Lock()
 
 
 @app.workflow
-class CodeDevelopmentWorkflow(Workflow[Dict[str, str]]):
+class CodeDevelopmentWorkflow(Workflow[Dict[str, Any]]):
     """
     Autonomous code development workflow.
     This workflow handles end-to-end software development tasks.
     """
 
     @app.workflow_run
-    async def run(self, dev_request: Dict[str, str]) -> WorkflowResult[str]:
+    async def run(self, dev_request: Dict[str, Any]) -> WorkflowResult[str]:
         """
         Develop code based on requirements.
 
         Args:
-            dev_request: Dictionary with 'task', 'language', and 'requirements'
+            dev_request: Dictionary with 'task', 'language', and 'requirements'.
+                Set 'use_cache' to false to always regenerate (e.g. for
+                nondeterministic, high-temperature runs).
 
         Returns:
             WorkflowResult containing the developed code and documentation
         """
         
-        task = dev_request.get('task', 'Code development task')
-        language = dev_request.get('language', 'python')
-        requirements = dev_request.get('requirements', 'Standard best practices')
+        request = DevRequest.from_dict(dev_request)
         
-        logger.info(f"CodeDevelopmentWorkflow: {task} in {language}")
-        
-        context = app.context
-        if "filesystem" in context.config.mcp.servers:
-            context.config.mcp.servers["filesystem"].args.extend([os.getcwd()])
-
-        # Create specialized development agents
-        architect_agent = Agent(
-            name="architect",
-            instruction="""You are a Software Architect. Design system architecture, 
-            define interfaces, and create technical specifications. Focus on scalability, 
-            maintainability, and best practices.""",
-            server_names=["filesystem"] if "filesystem" in context.config.mcp.servers else [],
+        logger.info(
+            "CodeDevelopmentWorkflow: %s in %s",
+            request.task[:LOG_PREVIEW_CHARS],
+            request.language[:LOG_PREVIEW_CHARS],
         )
 
-        developer_agent = Agent(
-            name="developer", 
-            instruction="""You are a Senior Developer. Write clean, efficient, well-documented code.
-            Implement the architecture specifications with proper error handling, logging, 
-            and following language-specific best practices.""",
-            server_names=["filesystem"] if "filesystem" in context.config.mcp.servers else [],
-        )
+        development_details = _build_dev_prompt(request.task, request.language, request.requirements)
+        use_cache = dev_request.get("use_cache", True)
+        if not isinstance(use_cache, bool):
+            raise TypeError(f"use_cache must be a boolean, got {type(use_cache).__name__}")
+        cache_key = hashlib.blake2b(development_details.encode(), digest_size=16).hexdigest()
+
+        if use_cache:
+            async with _DEV_RESPONSE_LOCK:
+                cached = _DEV_RESPONSE_CACHE.get(cache_key)
+            if cached is not None:
+                logger.info("CodeDevelopmentWorkflow: response cache hit")
+                return WorkflowResult(value=cached)
+        
+        fs_servers = _FS_SERVERS if app.context.server_flags.has_fs else _NO_SERVERS
+
+        # Specialized development agents
+        architect_llm = await get_agent_llm("architect", ARCHITECT_INSTRUCTION, fs_servers)
+        developer_llm = await get_agent_llm("developer", DEVELOPER_INSTRUCTION, fs_servers)
+        tester_llm = await get_agent_llm("tester", TESTER_INSTRUCTION, fs_servers)
+        reviewer_llm = await get_agent_llm("reviewer", REVIEWER_INSTRUCTION)
+        checker_llm = await get_agent_llm("review_checker", REVIEW_CHECK_INSTRUCTION)
+
+        params = RequestParams(maxTokens=DEVELOPMENT_MAX_TOKENS)
 
-        tester_agent = Agent(
-            name="tester",
-            instruction="""You are a QA Engineer. Create comprehensive test suites,
-            identify edge cases, and ensure code quality. Write unit tests, integration tests,
-            and provide testing strategies.""",
-            server_names=["filesystem"] if "filesystem" in context.config.mcp.servers else [],
+        # Developer and tester build on the architecture, so it is the only serial step
+        architecture = await architect_llm.generate_str(
+            message=cached_user_message(DEVELOPMENT_ARCHITECTURE_PROMPT, development_details),
+            request_params=params,
         )
+        architecture = _require_response("CodeDevelopmentWorkflow", architecture)
+        architecture_details = f"""{development_details}
 
-        reviewer_agent = Agent(
-            name="reviewer",
-            instruction="""You are a Code Reviewer. Analyze code for quality, security,
-            performance, and maintainability. Provide constructive feedback and ensure
-            adherence to coding standards and best practices.""",
+## Architecture
+{architecture}"""
+
+        # The review starts speculatively on the architecture alone instead of
+        # waiting for the implementation and tests
+        implementation, tests, review = await asyncio.gather(
+            developer_llm.generate_str(
+                message=cached_user_message(DEVELOPMENT_IMPLEMENTATION_PROMPT, architecture_details),
+                request_params=params,
+            ),
+            tester_llm.generate_str(
+                message=cached_user_message(DEVELOPMENT_TESTING_PROMPT, architecture_details),
+                request_params=params,
+            ),
+            reviewer_llm.generate_str(
+                message=cached_user_message(DEVELOPMENT_ARCHITECTURE_REVIEW_PROMPT, architecture_details),
+                request_params=params,
+            ),
+        )
+        implementation, tests, review = (
+            _require_response("CodeDevelopmentWorkflow", part) for part in (implementation, tests, review)
         )
 
-        # Use parallel execution for development workflow
-        parallel_dev = ParallelLLM(
-            fan_in_agent=reviewer_agent,
-            fan_out_agents=[architect_agent, developer_agent, tester_agent],
-            llm_factory=AnthropicAugmentedLLM,
-            context=app.context,
+        verdict = await checker_llm.generate_str(
+            message=cached_user_message(
+                REVIEW_CHECK_PROMPT,
+                f"""## Review
+{review}
+
+## Implementation
+{implementation}""",
+            ),
+            request_params=RequestParams(maxTokens=REVIEW_CHECK_MAX_TOKENS),
         )
+        if not verdict.strip().upper().startswith("YES"):
+            logger.info("CodeDevelopmentWorkflow: speculative review superseded, reviewing final code")
+            review = await reviewer_llm.generate_str(
+                message=cached_user_message(
+                    DEVELOPMENT_REVIEW_PROMPT,
+                    f"""{architecture_details}
 
-        development_prompt = f"""
-        Development Task: {task}
-        Programming Language: {language}
-        Requirements: {requirements}
-        
-        Architect: Design the system architecture and technical specifications
-        Developer: Implement the solution with clean, documented code
-        Tester: Create comprehensive tests and quality assurance strategy
-        Reviewer: Provide final code review and recommendations
-        
-        Deliver a complete, production-ready solution.
-        """
+## Implementation
+{implementation}
+
+## Tests
+{tests}""",
+                ),
+                request_params=params,
+            )
+            review = _require_response("CodeDevelopmentWorkflow", review)
+
+        result = f"""## Architecture
+{architecture}
+
+## Implementation
+{implementation}
 
-        result = await parallel_dev.generate_str(message=development_prompt)
+## Tests
+{tests}
+
+## Review
+{review}"""
+
+        if use_cache:
+            async with _DEV_RESPONSE_LOCK:
+                if len(_DEV_RESPONSE_CACHE) >= _DEV_RESPONSE_CACHE_SIZE:
+                    del _DEV_RESPONSE_CACHE[next(iter(_DEV_RESPONSE_CACHE))]
+                _DEV_RESPONSE_CACHE[cache_key] = result
         
-        logger.info(f"Code development completed for {task}")
+        logger.info("Code development completed for %s", request.task[:LOG_PREVIEW_CHARS])
         return WorkflowResult(value=result)
 
 
@@ -283,82 +1246,94 @@ class VIRAOrchestrationWorkflow(Workflow[Dict[str, Any]]):
             WorkflowResult containing the coordinated project execution results
         """
         
-        project_description = project_request.get('description', 'Complex project')
-        project_type = project_request.get('type', 'general')
-        priority = project_request.get('priority', 'medium')
+        request = ProjectRequest.from_dict(project_request)
         
-        logger.info(f"VIRAOrchestrationWorkflow: {project_type} project - {project_description}")
+        logger.info(
+            "VIRAOrchestrationWorkflow: %s project - %s",
+            request.type[:LOG_PREVIEW_CHARS],
+            request.description[:LOG_PREVIEW_CHARS],
+        )
         
-        context = app.context
-        available_servers = []
-        if "filesystem" in context.config.mcp.servers:
-            context.config.mcp.servers["filesystem"].args.extend([os.getcwd()])
-            available_servers.append("filesystem")
-        if "fetch" in context.config.mcp.servers:
-            available_servers.append("fetch")
-
-        orchestrator_agent = Agent(
-            name="vira_orchestrator",
-            instruction="""You are VIRA's Master Orchestrator - the central intelligence that coordinates
-            all specialized agents to execute complex projects. Your responsibilities:
-            
-            1. Project analysis and requirement gathering
-            2. Agent selection and task delegation
-            3. Workflow coordination and dependency management
-            4. Progress monitoring and quality assurance
-            5. Integration of results from multiple agents
-            6. Final project delivery and documentation
-            
-            You have access to Planning, Research, and Development agents. Coordinate their efforts
-            to deliver exceptional results that exceed user expectations.""",
-            server_names=available_servers,
+        flags = app.context.server_flags
+        fs_servers = _FS_SERVERS if flags.has_fs else _NO_SERVERS
+        fetch_servers = _FETCH_SERVERS if flags.has_fetch else _NO_SERVERS
+        if flags.has_fs and flags.has_fetch:
+            available_servers = _FS_FETCH_SERVERS
+        else:
+            available_servers = fs_servers or fetch_servers
+
+        project_details = request.details()
+
+        # Specialist agents work on independent slices of the project concurrently
+        planner_llm = await get_agent_llm("orchestration_planner", PLANNING_INSTRUCTION, fs_servers)
+        researcher_llm = await get_agent_llm("orchestration_researcher", RESEARCH_INSTRUCTION, fetch_servers)
+        developer_llm = await get_agent_llm("orchestration_developer", ARCHITECT_INSTRUCTION, fs_servers)
+        llm = await get_agent_llm("vira_orchestrator", ORCHESTRATOR_INSTRUCTION, available_servers)
+
+        logger.info("VIRA Orchestrator: Initializing project coordination...")
+
+        # Fan out to the specialists concurrently, then synthesize their outputs
+        phase_params = RequestParams(maxTokens=ORCHESTRATION_PHASE_MAX_TOKENS)
+        plan, research, development = await asyncio.gather(
+            planner_llm.generate_str(
+                message=cached_user_message(ORCHESTRATION_PLANNING_PROMPT, project_details),
+                request_params=phase_params,
+            ),
+            researcher_llm.generate_str(
+                message=cached_user_message(ORCHESTRATION_RESEARCH_PROMPT, project_details),
+                request_params=phase_params,
+            ),
+            developer_llm.generate_str(
+                message=cached_user_message(ORCHESTRATION_DEVELOPMENT_PROMPT, project_details),
+                request_params=phase_params,
+            ),
+        )
+        plan, research, development = (
+            _require_response("VIRAOrchestrationWorkflow", part) for part in (plan, research, development)
         )
 
-        async with orchestrator_agent:
-            logger.info("VIRA Orchestrator: Initializing project coordination...")
-            
-            llm = await orchestrator_agent.attach_llm(AnthropicAugmentedLLM)
-            
+        logger.info("VIRA Orchestrator: Specialist contributions received, integrating...")
+
+        with partial_results(self):
             orchestration_result = await llm.generate_str(
-                message=f"""Execute this complex project with full agent coordination:
-                
-                Project: {project_description}
-                Type: {project_type}
-                Priority: {priority}
-                
-                As the VIRA Orchestrator, coordinate the execution by:
-                1. Breaking down the project into phases
-                2. Determining which specialized agents to involve
-                3. Managing dependencies between tasks
-                4. Ensuring quality and integration
-                5. Delivering comprehensive results
-                
-                Available specialized capabilities:
-                - Planning Agent: Task decomposition and execution planning
-                - Research Agent: Investigation and analysis
-                - Development Team: Architecture, coding, testing, and review
-                
-                Provide a complete project execution with all phases coordinated.""",
-                request_params=RequestParams(
-                    modelPreferences=ModelPreferences(
-                        intelligencePriority=0.9,
-                        costPriority=0.05,
-                        speedPriority=0.05,
-                    )
-                )
+                message=cached_user_message(
+                    ORCHESTRATION_PROMPT,
+                    f"""{project_details}
+
+## Planning Agent
+{plan}
+
+## Research Agent
+{research}
+
+## Development Team
+{development}""",
+                ),
+                request_params=RequestParams(maxTokens=ORCHESTRATION_MAX_TOKENS),
             )
-            
-            logger.info(f"Project orchestration completed: {project_type}")
-            return WorkflowResult(value=orchestration_result)
+        orchestration_result = _require_response("VIRAOrchestrationWorkflow", orchestration_result)
+        
+        logger.info("Project orchestration completed: %s", request.type[:LOG_PREVIEW_CHARS])
+        return WorkflowResult(value=orchestration_result)
 
 
 @app.workflow
-class ClaudeCodeIntegrationWorkflow(Workflow[Dict[str, str]]):
+class ClaudeCodeIntegrationWorkflow(SingleAgentWorkflow):
     """
     Workflow that integrates with Claude Code for repository operations
     and advanced file management.
     """
 
+    AGENT_NAME = "claude_code_specialist"
+    INSTRUCTION = CLAUDE_CODE_INSTRUCTION
+    PROMPT = CLAUDE_CODE_PROMPT
+    MAX_TOKENS = CLAUDE_CODE_MAX_TOKENS
+    # Results depend on the current repository contents, so they are never reused
+    USE_RESPONSE_CACHE = False
+
+    def server_names(self, flags: ServerFlags) -> List[str]:
+        return _FS_SERVERS if flags.has_fs else _NO_SERVERS
+
     @app.workflow_run
     async def run(self, code_request: Dict[str, str]) -> WorkflowResult[str]:
         """
@@ -371,92 +1346,69 @@ class ClaudeCodeIntegrationWorkflow(Workflow[Dict[str, str]]):
             WorkflowResult containing Claude Code execution results
         """
         
-        operation = code_request.get('operation', 'analyze')
-        target = code_request.get('target', '.')
-        prompt = code_request.get('prompt', 'Analyze and improve this code')
-        
-        logger.info(f"ClaudeCodeIntegrationWorkflow: {operation} on {target}")
+        request = CodeRequest.from_dict(code_request)
         
-        context = app.context
-        if "filesystem" in context.config.mcp.servers:
-            context.config.mcp.servers["filesystem"].args.extend([os.getcwd()])
-
-        claude_code_agent = Agent(
-            name="claude_code_specialist",
-            instruction="""You are VIRA's Claude Code Integration Specialist. You excel at:
-            
-            1. Repository analysis and code review
-            2. Automated refactoring and optimization
-            3. Git workflow management
-            4. Project structure improvements
-            5. Code generation and documentation
-            6. Development workflow automation
-            
-            You work seamlessly with Claude Code CLI to provide advanced development capabilities
-            that go beyond simple code execution to full repository management.""",
-            server_names=["filesystem"] if "filesystem" in context.config.mcp.servers else [],
+        logger.info(
+            "ClaudeCodeIntegrationWorkflow: %s on %s",
+            request.operation[:LOG_PREVIEW_CHARS],
+            request.target[:LOG_PREVIEW_CHARS],
         )
+        return await self.generate(request.details())
 
-        async with claude_code_agent:
-            logger.info("Claude Code Agent: Connected, preparing repository operations...")
-            
-            llm = await claude_code_agent.attach_llm(AnthropicAugmentedLLM)
-            
-            integration_result = await llm.generate_str(
-                message=f"""Execute Claude Code integration for repository operations:
-                
-                Operation: {operation}
-                Target: {target}
-                Prompt: {prompt}
-                
-                As the Claude Code specialist, provide:
-                1. Analysis of the target repository/files
-                2. Recommended Claude Code commands
-                3. Step-by-step execution plan
-                4. Expected outcomes and benefits
-                5. Integration with development workflow
-                6. Quality assurance and validation steps
-                
-                Ensure seamless integration between VIRA's intelligence and Claude Code's capabilities.""",
-                request_params=RequestParams(
-                    modelPreferences=ModelPreferences(
-                        intelligencePriority=0.8,
-                        speedPriority=0.2,
-                        costPriority=0.0,
-                    )
-                )
-            )
-            
-            logger.info(f"Claude Code integration completed: {operation}")
-            return WorkflowResult(value=integration_result)
+
+_WORKFLOW_DESCRIPTIONS: Final[Dict[str, str]] = {
+    "PlanningWorkflow": "Task planning and execution coordination",
+    "ResearchWorkflow": "Autonomous research and analysis",
+    "LiveResearchWorkflow": "Research with live web sources",
+    "CodeDevelopmentWorkflow": "End-to-end software development",
+    "VIRAOrchestrationWorkflow": "Multi-agent project coordination",
+    "ClaudeCodeIntegrationWorkflow": "Repository management and Claude Code integration",
+}
+
+
+def _ensure_cwd_in_fs_args(context):
+    """Grant the filesystem server access to the current directory, at most once"""
+    if "filesystem" not in context.config.mcp.servers:
+        return
+
+    fs = context.config.mcp.servers["filesystem"]
+    if os.getcwd() not in fs.args:
+        fs.args.append(os.getcwd())
 
 
 async def main():
     """Main entry point for VIRA Agent MCP Server"""
-    async with app.run() as agent_app:
+    async with (
+        app.run() as agent_app,
+        agent_registry(),
+        aclosing(_SHARED_HTTPX),
+        aclosing(_BATCHER),
+    ):
         # Configure available servers
         context = agent_app.context
         
         # Add filesystem access to current directory
-        if "filesystem" in context.config.mcp.servers:
-            context.config.mcp.servers["filesystem"].args.extend([os.getcwd()])
+        _ensure_cwd_in_fs_args(context)
+        context.server_flags = ServerFlags.from_config(context.config)
+
+        # Preload the research corpus for cache-augmented generation
+        global KNOWLEDGE_BASE
+        KNOWLEDGE_BASE = load_knowledge_base()
+        if KNOWLEDGE_BASE:
+            logger.info("📚 Research knowledge base loaded from %s", RESEARCH_CORPUS_DIR)
 
         # Log VIRA system initialization
         logger.info("🤖 VIRA Agent System Initializing...")
-        logger.info(f"Creating MCP server for {agent_app.name}")
+        logger.info("Creating MCP server for %s", agent_app.name)
 
         # Log available workflows (specialized agents)
         logger.info("🎯 Specialized Agent Workflows Available:")
         for workflow_id in agent_app.workflows:
-            workflow_descriptions = {
-                "PlanningWorkflow": "Task planning and execution coordination",
-                "ResearchWorkflow": "Autonomous research and analysis", 
-                "CodeDevelopmentWorkflow": "End-to-end software development",
-                "VIRAOrchestrationWorkflow": "Multi-agent project coordination",
-                "ClaudeCodeIntegrationWorkflow": "Repository management and Claude Code integration"
-            }
-            description = workflow_descriptions.get(workflow_id, "Specialized workflow")
-            logger.info(f"  🔧 {workflow_id}: {description}")
+            logger.info(
+                "  🔧 %s: %s",
+                workflow_id,
+                _WORKFLOW_DESCRIPTIONS.get(workflow_id, "Specialized workflow"),
+            )
 
         logger.info("✅ VIRA Agent System Ready - All specialized agents online!")
         
@@ -466,4 +1418,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -0,0 +1,181 @@
+"""End-to-end smoke tests that drive the workflows through a mocked Anthropic API"""
+
+import json
+import os
+import unittest
+
+import httpx2
+from anthropic.types import Usage
+
+os.environ.setdefault("ANTHROPIC_API_KEY", "test-key")
+
+import server
+
+
+def _message(text: str) -> dict:
+    return {
+        "id": "msg_test",
+        "type": "message",
+        "role": "assistant",
+        "model": "claude-test",
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 10, "output_tokens": 5},
+    }
+
+
+def _event_stream(text: str) -> bytes:
+    start = {**_message(""), "content": [], "stop_reason": None}
+    events = [
+        ("message_start", {"type": "message_start", "message": start}),
+        ("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}),
+        ("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}}),
+        ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+        ("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": 5}}),
+        ("message_stop", {"type": "message_stop"}),
+    ]
+    return "".join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events).encode()
+
+
+class WorkflowSmokeTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+        self.fail_requests = False
+        self.fail_streamed_requests = False
+        self.review_verdict = "YES"
+
+        def handler(request: httpx2.Request) -> httpx2.Response:
+            body = json.loads(request.content)
+            self.requests.append(body)
+            if self.fail_requests or (self.fail_streamed_requests and body.get("stream")):
+                error = {"type": "invalid_request_error", "message": "rejected by test"}
+                return httpx2.Response(400, json={"type": "error", "error": error})
+            system = [block["text"] for block in body.get("system", [])]
+            preamble = body["messages"][0]["content"][0]["text"]
+            if server.REVIEW_CHECK_INSTRUCTION in system:
+                return httpx2.Response(200, json=_message(self.review_verdict))
+            if preamble == server.DEVELOPMENT_REVIEW_PROMPT:
+                return httpx2.Response(200, json=_message("final review"))
+            if body.get("stream"):
+                return httpx2.Response(
+                    200,
+                    content=_event_stream("streamed answer"),
+                    headers={"content-type": "text/event-stream"},
+                )
+            return httpx2.Response(200, json=_message("created answer"))
+
+        self._shared_httpx = server._SHARED_HTTPX
+        server._SHARED_HTTPX = httpx2.AsyncClient(transport=httpx2.MockTransport(handler))
+        server._BATCHER._clients.clear()
+
+        self._stack = server.AsyncExitStack()
+        agent_app = await self._stack.enter_async_context(server.app.run())
+        await self._stack.enter_async_context(server.agent_registry())
+        await self._stack.enter_async_context(server.aclosing(server._BATCHER))
+        agent_app.context.server_flags = server.ServerFlags.from_config(agent_app.context.config)
+
+    async def asyncTearDown(self):
+        await self._stack.aclose()
+        await server._SHARED_HTTPX.aclose()
+        server._SHARED_HTTPX = self._shared_httpx
+
+    async def test_streamed_workflows(self):
+        planning = await server.PlanningWorkflow().run("Plan the smoke test")
+        research = await server.ResearchWorkflow().run("Smoke test research")
+        live_research = await server.LiveResearchWorkflow().run("Smoke test live research")
+        claude_code = await server.ClaudeCodeIntegrationWorkflow().run({"operation": "analyze", "target": "."})
+
+        for result in (planning, research, live_research, claude_code):
+            self.assertEqual(result.value, "streamed answer")
+        self.assertEqual(len(self.requests), 4)
+        self.assertTrue(all(body["stream"] for body in self.requests))
+
+    async def test_non_streamed_workflows(self):
+        development = await server.CodeDevelopmentWorkflow().run({"task": "Smoke test", "use_cache": False})
+        orchestration = await server.VIRAOrchestrationWorkflow().run({"description": "Smoke test"})
+
+        self.assertIn("## Implementation\ncreated answer", development.value)
+        self.assertEqual(orchestration.value, "streamed answer")
+        self.assertEqual(
+            [body["max_tokens"] for body in self.requests if not body.get("stream")],
+            [server.DEVELOPMENT_MAX_TOKENS] * 4
+            + [server.REVIEW_CHECK_MAX_TOKENS]
+            + [server.ORCHESTRATION_PHASE_MAX_TOKENS] * 3,
+        )
+
+    async def test_cache_breakpoints_after_knowledge_base_and_preamble(self):
+        knowledge_base = server.KNOWLEDGE_BASE
+        server.KNOWLEDGE_BASE = "# Research Knowledge Base"
+        try:
+            await server.ResearchWorkflow().run("Smoke test knowledge base")
+        finally:
+            server.KNOWLEDGE_BASE = knowledge_base
+
+        (body,) = self.requests
+        self.assertEqual(["cache_control" in block for block in body["system"]], [False, True])
+        self.assertEqual(["cache_control" in block for block in body["messages"][0]["content"]], [True, False])
+
+    async def test_failed_completion_raises_and_is_not_cached(self):
+        self.fail_requests = True
+        with self.assertRaises(RuntimeError):
+            await server.PlanningWorkflow().run("Plan the failing smoke test")
+
+        self.fail_requests = False
+        retry = await server.PlanningWorkflow().run("Plan the failing smoke test")
+
+        self.assertEqual(retry.value, "streamed answer")
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_rejected_speculative_review_is_redone(self):
+        self.review_verdict = "NO"
+        development = await server.CodeDevelopmentWorkflow().run({"task": "Rejected review", "use_cache": False})
+
+        final_reviews = [
+            body for body in self.requests
+            if body["messages"][0]["content"][0]["text"] == server.DEVELOPMENT_REVIEW_PROMPT
+        ]
+        self.assertEqual(len(final_reviews), 1)
+        self.assertIn(server.REVIEWER_INSTRUCTION, [block["text"] for block in final_reviews[0]["system"]])
+        self.assertTrue(development.value.endswith("## Review\nfinal review"))
+
+    async def test_failed_development_step_is_not_cached(self):
+        self.fail_requests = True
+        with self.assertRaises(RuntimeError):
+            await server.CodeDevelopmentWorkflow().run({"task": "Failing cached smoke test"})
+
+        self.fail_requests = False
+        development = await server.CodeDevelopmentWorkflow().run({"task": "Failing cached smoke test"})
+
+        self.assertIn("## Implementation\ncreated answer", development.value)
+
+    async def test_failed_orchestration_specialists_raise(self):
+        self.fail_requests = True
+        with self.assertRaises(RuntimeError):
+            await server.VIRAOrchestrationWorkflow().run({"description": "Failing specialists"})
+
+        self.assertEqual(len(self.requests), 3)
+        self.assertFalse(any(body.get("stream") for body in self.requests))
+
+    async def test_failed_orchestration_synthesis_raises(self):
+        self.fail_streamed_requests = True
+        with self.assertRaises(RuntimeError):
+            await server.VIRAOrchestrationWorkflow().run({"description": "Failing synthesis"})
+
+        self.assertEqual(len(self.requests), 4)
+
+    async def test_use_cache_must_be_a_bool(self):
+        with self.assertRaises(TypeError):
+            await server.CodeDevelopmentWorkflow().run({"task": "Smoke test", "use_cache": "false"})
+
+
+class AdmissionTest(unittest.TestCase):
+    def test_cache_writes_are_metered(self):
+        usage = Usage(input_tokens=10, output_tokens=5, cache_creation_input_tokens=2048)
+
+        self.assertEqual(server._metered_tokens(usage), 2063)
+        self.assertEqual(server._metered_tokens(Usage(input_tokens=10, output_tokens=5)), 15)
+
+
+if __name__ == "__main__":
+    unittest.main()